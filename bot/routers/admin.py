@@ -0,0 +1,54 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from bot.utils.profiler import (
+    PROFILE_INTERVAL_MS,
+    PROFILE_KEEP,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_SLOW_MS,
+    profile_store,
+    profiling_enabled,
+)
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    # Sin ADMIN_TOKEN configurado, /admin no existe (perfiles = rutas, tiempos y pilas internas)
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid X-Admin-Token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(verify_admin_token)])
+
+
+@router.get("/profiles")
+def list_profiles():
+    return {
+        "enabled": profiling_enabled(),
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "slow_ms": PROFILE_SLOW_MS,
+        "interval_ms": PROFILE_INTERVAL_MS,
+        "keep": PROFILE_KEEP,
+        "profiles": profile_store.list(),
+    }
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: int):
+    # Formato 'folded': flamegraph.pl perfil.txt > perfil.svg  |  speedscope perfil.txt
+    folded = profile_store.folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
+
+
+@router.delete("/profiles", status_code=204)
+def clear_profiles():
+    profile_store.clear()
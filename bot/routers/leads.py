@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from bot.schemas.lead import LeadCreate, LeadOut, LeadUpdate
+from bot.utils.responses import RawJSONResponse
+from bot.services.admission import admission, track_in_flight
 from bot.services.sheets_service import (
-    list_leads as list_leads_service,
+    list_leads_json,
+    cached_leads_json,
+    has_cached_leads,
     save_lead,
     update_lead_by_id,
     DuplicateLeadError,
@@ -17,7 +21,7 @@ def health():
     return {"status": "ok"}
 
 
-@router.post("/leads", status_code=201, response_model=LeadOut)
+@router.post("/leads", status_code=201, response_model=LeadOut, dependencies=[Depends(track_in_flight)])
 def create_lead(payload: LeadCreate):
     try:
         return save_lead(payload)
@@ -25,12 +29,15 @@ def create_lead(payload: LeadCreate):
         raise HTTPException(status_code=409, detail=str(e))
 
 
-@router.get("/leads")
+@router.get("/leads", response_class=RawJSONResponse, dependencies=[Depends(track_in_flight)])
 def list_leads():
-    return list_leads_service()
+    # Si Sheets va lento se sirve la última copia en caché (con lecturas de prueba periódicas)
+    if has_cached_leads() and admission.should_shed("leads_refresh", downstream="sheets"):
+        return RawJSONResponse(cached_leads_json())
+    return RawJSONResponse(list_leads_json())
 
 
-@router.patch("/leads/{lead_id}", response_model=LeadOut)
+@router.patch("/leads/{lead_id}", response_model=LeadOut, dependencies=[Depends(track_in_flight)])
 def patch_lead(lead_id: str, payload: LeadUpdate):
     updates = payload.model_dump(exclude_none=True)
     if not updates:
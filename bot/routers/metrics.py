@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from bot.services.admission import admission
+from bot.services.intent_router import intent_router
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/admission")
+def admission_metrics():
+    return admission.snapshot()
+
+
+@router.get("/intents")
+def intent_metrics():
+    return intent_router.stats()
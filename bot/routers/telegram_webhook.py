@@ -1,10 +1,11 @@
 import os
 import inspect
 import httpx
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from typing import Optional, Any
 
 from bot.services.conversation_flow import handle_message
+from bot.services.admission import track_in_flight
 
 router = APIRouter()
 
@@ -19,7 +20,7 @@ async def run_handle_message(sender_id: str, text: str, source: str) -> Optional
     return reply or None
 
 
-@router.post("/webhook/telegram")
+@router.post("/webhook/telegram", dependencies=[Depends(track_in_flight)])
 async def telegram_webhook(request: Request):
     update = await request.json()
 
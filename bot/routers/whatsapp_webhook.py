@@ -7,11 +7,17 @@ import inspect
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import PlainTextResponse, JSONResponse
 
 from bot.services.conversation_flow import handle_message
-from bot.services.sheets_service import was_message_processed, mark_message_processed
+from bot.services.sheets_service import (
+    was_message_processed,
+    mark_message_processed,
+    call_sheets,
+    SheetsTimeoutError,
+)
+from bot.services.admission import admission, track_in_flight
 
 logger = logging.getLogger("whatsapp")
 
@@ -157,7 +163,7 @@ def verify_whatsapp_webhook(request: Request):
     raise HTTPException(status_code=403, detail="Webhook verification failed")
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(track_in_flight)])
 async def whatsapp_webhook(request: Request):
     raw = await request.body()
     signature = request.headers.get("X-Hub-Signature-256")
@@ -179,15 +185,18 @@ async def whatsapp_webhook(request: Request):
         if not wa_from:
             continue
 
-        # Idempotencia persistente
-        if msg_id and was_message_processed(msg_id):
-            logger.info("WA duplicated message ignored: %s", msg_id)
-            continue
-        if msg_id:
-            mark_message_processed(msg_id)
-
-        # Mark as read (nice)
+        # Idempotencia persistente (gspread es bloqueante -> fuera del event loop)
         if msg_id:
+            try:
+                if await call_sheets(was_message_processed, msg_id):
+                    logger.info("WA duplicated message ignored: %s", msg_id)
+                    continue
+                await call_sheets(mark_message_processed, msg_id)
+            except SheetsTimeoutError:
+                logger.warning("WA idempotency check timed out, processing anyway: %s", msg_id)
+
+        # Mark as read (nice) -> se omite si hay sobrecarga
+        if msg_id and not admission.should_shed("whatsapp_read"):
             await mark_whatsapp_read(msg_id)
 
         user_text, detected = extract_user_text(msg)
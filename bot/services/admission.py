@@ -0,0 +1,234 @@
+# bot/services/admission.py
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Deque, Dict, Optional, Tuple
+
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "32"))
+ADMISSION_LATENCY_SLO_MS = float(os.getenv("ADMISSION_LATENCY_SLO_MS", "2000"))
+ADMISSION_WINDOW_S = float(os.getenv("ADMISSION_WINDOW_S", "30"))
+# Muestras mínimas en la ventana para juzgar una dependencia, y percentil usado
+ADMISSION_MIN_SAMPLES = int(os.getenv("ADMISSION_MIN_SAMPLES", "5"))
+ADMISSION_PERCENTILE = float(os.getenv("ADMISSION_PERCENTILE", "90"))
+# En modo degraded se deja pasar una llamada de prueba por feature cada N segundos
+ADMISSION_PROBE_INTERVAL_S = float(os.getenv("ADMISSION_PROBE_INTERVAL_S", "5"))
+
+MODE_NORMAL = "normal"
+MODE_DEGRADED = "degraded"
+
+# Respuesta fija cuando no se llama a la IA por sobrecarga
+CANNED_AI_REPLY = (
+    "Ahora mismo tenemos mucha carga y no puedo responder a consultas. "
+    "Si quieres dejar tus datos, escribe 'start' y te contactamos."
+)
+
+
+class LatencyClaim:
+    """
+    Garantiza una sola muestra de latencia por llamada: la registra quien llegue
+    primero (el handler al vencer su timeout, o el hilo al terminar).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+
+_latency_claim: ContextVar[Optional[LatencyClaim]] = ContextVar("latency_claim", default=None)
+
+
+@contextmanager
+def single_latency_sample():
+    """
+    Las muestras registradas con timed() dentro del bloque (también en hilos
+    lanzados desde él, que heredan el contexto) pasan por el LatencyClaim devuelto.
+    """
+    claim = LatencyClaim()
+    token = _latency_claim.set(claim)
+    try:
+        yield claim
+    finally:
+        _latency_claim.reset(token)
+
+
+class AdmissionController:
+    """
+    Control de admisión adaptativo.
+    - Cuenta el trabajo en curso (webhooks y /leads)
+    - Guarda la latencia reciente de cada dependencia (sheets, groq) en una ventana deslizante
+      y la juzga por percentil, solo con un mínimo de muestras
+    - En modo 'degraded' se descarta el trabajo no esencial (should_shed), salvo una
+      llamada de prueba periódica por feature para que lleguen muestras nuevas
+    Los pasos del formulario de lead nunca pasan por aquí: siempre se aceptan.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        latency_slo_ms: float,
+        window_s: float,
+        min_samples: int = 5,
+        percentile: float = 90,
+        probe_interval_s: float = 5,
+    ):
+        self.max_in_flight = max_in_flight
+        self.latency_slo_ms = latency_slo_ms
+        self.window_s = window_s
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.probe_interval_s = probe_interval_s
+        self._in_flight = 0
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._shed: Dict[str, int] = {}
+        self._probes: Dict[str, int] = {}
+        self._last_probe: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Trabajo en curso
+    # -----------------------------
+    def enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def exit(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    # -----------------------------
+    # Latencia de dependencias
+    # -----------------------------
+    def observe(self, downstream: str, elapsed_ms: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            samples = self._samples.setdefault(downstream, deque())
+            samples.append((now, elapsed_ms))
+            self._expire(samples, now)
+
+    @contextmanager
+    def timed(self, downstream: str):
+        t0 = time.perf_counter()
+        claim = _latency_claim.get()
+        try:
+            yield
+        finally:
+            if claim is None or claim.claim():
+                self.observe(downstream, (time.perf_counter() - t0) * 1000)
+
+    def _expire(self, samples: Deque[Tuple[float, float]], now: float) -> None:
+        while samples and now - samples[0][0] > self.window_s:
+            samples.popleft()
+
+    def _latencies_ms(self) -> Dict[str, float]:
+        """
+        Percentil de latencia por dependencia (solo las que tienen min_samples en la ventana).
+        """
+        now = time.monotonic()
+        out: Dict[str, float] = {}
+        for name, samples in self._samples.items():
+            self._expire(samples, now)
+            if len(samples) < max(1, self.min_samples):
+                continue
+            ordered = sorted(ms for _, ms in samples)
+            idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            out[name] = ordered[idx]
+        return out
+
+    # -----------------------------
+    # Decisión
+    # -----------------------------
+    def mode(self) -> str:
+        with self._lock:
+            return self._mode()
+
+    def _mode(self) -> str:
+        if self._in_flight > self.max_in_flight:
+            return MODE_DEGRADED
+        if any(ms >= self.latency_slo_ms for ms in self._latencies_ms().values()):
+            return MODE_DEGRADED
+        return MODE_NORMAL
+
+    def _is_slow(self, downstream: str) -> bool:
+        return self._latencies_ms().get(downstream, 0.0) >= self.latency_slo_ms
+
+    def should_shed(self, feature: str, downstream: Optional[str] = None) -> bool:
+        """
+        True si hay que descartar/aplazar 'feature' (trabajo no esencial).
+        - downstream=None: según el modo global (carga + latencia de todas las dependencias)
+        - downstream="sheets": solo si esa dependencia va lenta
+        Deja pasar una llamada de prueba cada probe_interval_s y cuenta descartes y pruebas.
+        """
+        with self._lock:
+            if downstream is None:
+                degraded = self._mode() == MODE_DEGRADED
+            else:
+                degraded = self._is_slow(downstream)
+            if not degraded:
+                return False
+            now = time.monotonic()
+            if now - self._last_probe.get(feature, float("-inf")) >= self.probe_interval_s:
+                self._last_probe[feature] = now
+                self._probes[feature] = self._probes.get(feature, 0) + 1
+                return False
+            self._shed[feature] = self._shed.get(feature, 0) + 1
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self._mode(),
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "latency_slo_ms": self.latency_slo_ms,
+                "latency_percentile": self.percentile,
+                "latency_ms": {k: round(v, 1) for k, v in self._latencies_ms().items()},
+                "samples": {k: len(v) for k, v in self._samples.items()},
+                "shed": dict(self._shed),
+                "probes": dict(self._probes),
+            }
+
+
+admission = AdmissionController(
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_LATENCY_SLO_MS,
+    ADMISSION_WINDOW_S,
+    min_samples=ADMISSION_MIN_SAMPLES,
+    percentile=ADMISSION_PERCENTILE,
+    probe_interval_s=ADMISSION_PROBE_INTERVAL_S,
+)
+
+
+def observe_latency(downstream: str):
+    """
+    Decorador: mide la latencia de una llamada (síncrona) a una dependencia.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with admission.timed(downstream):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def track_in_flight():
+    """
+    Dependencia FastAPI: cuenta la petición como trabajo en curso.
+    """
+    admission.enter()
+    try:
+        yield
+    finally:
+        admission.exit()
@@ -2,6 +2,8 @@ import os
 import httpx
 from typing import Optional
 
+from bot.services.admission import admission
+
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 AI_MODEL = os.getenv("AI_MODEL", "llama-3.3-70b-versatile")
 
@@ -33,20 +35,21 @@ async def ai_reply(user_text: str, history: Optional[list[dict]] = None) -> str:
     messages.append({"role": "user", "content": user_text})
 
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            r = await client.post(
-                GROQ_CHAT_URL,
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": AI_MODEL,
-                    "messages": messages,
-                    "temperature": 0.3,
-                    "max_tokens": 250,
-                },
-            )
+        with admission.timed("groq"):
+            async with httpx.AsyncClient(timeout=15) as client:
+                r = await client.post(
+                    GROQ_CHAT_URL,
+                    headers={
+                        "Authorization": f"Bearer {GROQ_API_KEY}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": AI_MODEL,
+                        "messages": messages,
+                        "temperature": 0.3,
+                        "max_tokens": 250,
+                    },
+                )
         r.raise_for_status()
         data = r.json()
         return data["choices"][0]["message"]["content"].strip()
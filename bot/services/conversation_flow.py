@@ -2,9 +2,11 @@ from dataclasses import dataclass, field
 from typing import Literal
 
 from bot.schemas.lead import LeadCreate
-from bot.services.sheets_service import save_lead, DuplicateLeadError
+from bot.services.sheets_service import save_lead, call_sheets, DuplicateLeadError, SheetsTimeoutError
 from bot.utils.phone import validate_phone_es
 from bot.services.ai_client import ai_reply
+from bot.services.admission import admission, CANNED_AI_REPLY
+from bot.services.intent_router import intent_router
 
 Step = Literal["name", "last_name", "phone", "address", "confirm"]
 
@@ -49,8 +51,13 @@ async def handle_message(user_id: str, text: str, source: str = "unknown") -> st
         clear_session(user_id)
         return "Cancelado ✅. Si quieres empezar otra vez: start"
 
-    # Si NO hay sesión -> IA
+    # Si NO hay sesión -> FAQ local, si no IA (o respuesta fija si hay sobrecarga)
     if not has_session(user_id):
+        local = intent_router.answer(text)
+        if local:
+            return local
+        if admission.should_shed("ai_reply"):
+            return CANNED_AI_REPLY
         return await ai_reply(text)
 
     s = get_session(user_id)
@@ -99,12 +106,15 @@ async def handle_message(user_id: str, text: str, source: str = "unknown") -> st
             try:
                 s.data["source"] = source
                 payload = LeadCreate(**s.data)
-                lead = save_lead(payload)
+                lead = await call_sheets(save_lead, payload)
                 clear_session(user_id)  # 🔥 vuelve a IA fuera del flujo
                 return f"✅ Guardado correctamente. ID: {lead.id}\nSi quieres otra alta: start"
             except DuplicateLeadError:
                 clear_session(user_id)
                 return "⚠️ Ese teléfono ya existe en la sheet. Si quieres probar con otro: start"
+            except SheetsTimeoutError:
+                clear_session(user_id)
+                return "⏳ El guardado está tardando más de lo normal. Si en unos minutos no te contactamos, vuelve a intentarlo con: start"
             except Exception:
                 clear_session(user_id)
                 return "❌ Ha ocurrido un error guardando el lead. Intenta de nuevo con: start"
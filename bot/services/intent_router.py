@@ -0,0 +1,249 @@
+# bot/services/intent_router.py
+
+import logging
+import os
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import yaml
+
+logger = logging.getLogger("intents")
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+# Rutas relativas se resuelven desde la raíz del proyecto (no desde el cwd)
+FAQ_FILE = os.getenv("FAQ_FILE", "bot/knowledge/faq.yaml")
+FAQ_RELOAD_INTERVAL_S = float(os.getenv("FAQ_RELOAD_INTERVAL_S", "2"))
+
+DEFAULT_MAX_TOKENS = 6
+DEFAULT_MIN_COVERAGE = 0.6
+
+# Palabras que no cuentan para la cobertura (ya sin acentos)
+DEFAULT_STOPWORDS = frozenset({
+    "a", "al", "con", "de", "del", "el", "en", "es", "la", "las", "lo", "los", "me", "mi",
+    "o", "os", "para", "por", "que", "se", "su", "sus", "te", "tu", "un", "una", "y",
+    "cual", "cuales", "hay", "teneis", "tiene", "tienen", "vuestro", "vuestra",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Minúsculas, sin acentos ni signos: "¿Horario?" -> ["horario"]
+    """
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass
+class Faq:
+    id: str
+    answer: str
+    weight: float = 1.0
+
+
+class FaqMatcher:
+    """
+    Índice de tokens compilado a partir del YAML.
+    - index: 1er token de cada frase -> [(tokens_de_la_frase, índice_faq)]
+    - Un mensaje encaja si:
+      * tiene como mucho max_tokens palabras
+      * una sola FAQ obtiene la puntuación máxima
+      * las frases de esa FAQ cubren al menos min_coverage de las palabras
+        del mensaje que no son stopwords ("gracias por nada, el servicio es horrible" no encaja)
+    - greetings: frases de saludo que tampoco cuentan para la cobertura si el mensaje
+      tiene algo más ("hola, ¿precio?" -> precio; "hola" solo sigue encajando)
+    """
+
+    def __init__(
+        self,
+        faqs: List[Faq],
+        index: Dict[str, List[Tuple[Tuple[str, ...], int]]],
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        min_coverage: float = DEFAULT_MIN_COVERAGE,
+        stopwords: FrozenSet[str] = DEFAULT_STOPWORDS,
+        greetings: FrozenSet[Tuple[str, ...]] = frozenset(),
+    ):
+        self.faqs = faqs
+        self.index = index
+        self.max_tokens = max_tokens
+        self.min_coverage = min_coverage
+        self.stopwords = stopwords
+        self.greetings = greetings
+
+    @classmethod
+    def empty(cls) -> "FaqMatcher":
+        return cls([], {})
+
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "FaqMatcher":
+        data = data or {}
+        settings = data.get("settings") or {}
+        max_tokens = int(settings.get("max_tokens", DEFAULT_MAX_TOKENS))
+        min_coverage = float(settings.get("min_coverage", DEFAULT_MIN_COVERAGE))
+        stopwords = DEFAULT_STOPWORDS | {t for w in settings.get("stopwords") or [] for t in tokenize(str(w))}
+        greetings = {tuple(tokenize(str(g))) for g in settings.get("greetings") or []}
+        greetings.discard(())
+
+        # canónica -> variantes (todas tokenizadas)
+        synonyms: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for canonical, variants in (data.get("synonyms") or {}).items():
+            key = tuple(tokenize(str(canonical)))
+            synonyms[key] = [tuple(tokenize(str(v))) for v in (variants or [])]
+
+        faqs: List[Faq] = []
+        index: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+
+        for entry in data.get("faqs") or []:
+            answer = str(entry.get("answer") or "").strip()
+            if not answer:
+                continue
+            faq_idx = len(faqs)
+            faqs.append(Faq(
+                id=str(entry.get("id") or faq_idx),
+                answer=answer,
+                weight=float(entry.get("weight", 1.0)),
+            ))
+
+            phrases = set()
+            for kw in entry.get("keywords") or []:
+                tokens = tuple(tokenize(str(kw)))
+                if not tokens:
+                    continue
+                phrases.add(tokens)
+                phrases.update(s for s in synonyms.get(tokens, []) if s)
+
+            for phrase in phrases:
+                index.setdefault(phrase[0], []).append((phrase, faq_idx))
+
+        return cls(faqs, index, max_tokens, min_coverage, frozenset(stopwords), frozenset(greetings))
+
+    def match(self, text: str) -> Optional[Faq]:
+        tokens = tokenize(text)
+        if not tokens or len(tokens) > self.max_tokens:
+            return None
+
+        matched = set()
+        covered: Dict[int, Set[int]] = {}  # faq -> posiciones de tokens cubiertas
+        for i, tok in enumerate(tokens):
+            for phrase, faq_idx in self.index.get(tok, ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    matched.add((phrase, faq_idx))
+                    covered.setdefault(faq_idx, set()).update(range(i, i + len(phrase)))
+
+        if not matched:
+            return None
+
+        scores: Dict[int, float] = {}
+        for phrase, faq_idx in matched:
+            scores[faq_idx] = scores.get(faq_idx, 0.0) + self.faqs[faq_idx].weight * len(phrase)
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        if len(ranked) > 1 and ranked[1][1] >= ranked[0][1]:
+            return None  # empate entre FAQs -> que conteste la IA
+
+        best = ranked[0][0]
+        content = [i for i, tok in enumerate(tokens) if tok not in self.stopwords]
+        if not content:
+            return None
+        greeting = self._greeting_positions(tokens)
+        content = [i for i in content if i not in greeting] or content
+        coverage = len(covered[best].intersection(content)) / len(content)
+        if coverage < self.min_coverage:
+            return None  # la keyword es solo una parte del mensaje -> IA
+        return self.faqs[best]
+
+    def _greeting_positions(self, tokens: List[str]) -> Set[int]:
+        out: Set[int] = set()
+        for phrase in self.greetings:
+            for i in range(len(tokens) - len(phrase) + 1):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    out.update(range(i, i + len(phrase)))
+        return out
+
+
+class IntentRouter:
+    """
+    Responde localmente las preguntas frecuentes (sin LLM).
+    - Recarga el YAML si cambia su mtime (comprobado cada FAQ_RELOAD_INTERVAL_S)
+    - Si el YAML nuevo es inválido, mantiene el anterior
+    """
+
+    def __init__(self, path: str, reload_interval_s: float):
+        self.path = Path(path) if Path(path).is_absolute() else PROJECT_DIR / path
+        self.reload_interval_s = reload_interval_s
+        self._matcher = FaqMatcher.empty()
+        self._mtime: Optional[float] = None
+        self._missing_logged = False
+        self._checked_at = 0.0
+        self.total = 0
+        self.local = 0
+        self.by_intent: Dict[str, int] = {}
+        self._maybe_reload(force=True)
+
+    def _maybe_reload(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval_s:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            # Se avisa una vez por ausencia, también si falla la primera carga
+            if not self._missing_logged:
+                self._missing_logged = True
+                if self._mtime is None:
+                    logger.warning("FAQ file not found: %s (no local answers, everything goes to the AI)", self.path)
+                else:
+                    logger.warning("FAQ file not found: %s (keeping last version)", self.path)
+            return
+        self._missing_logged = False
+
+        if mtime == self._mtime:
+            return
+
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                matcher = FaqMatcher.from_config(yaml.safe_load(f))
+        except Exception as e:
+            logger.warning("FAQ reload failed (%s): %s", self.path, e)
+            self._mtime = mtime  # no reintentar hasta el siguiente cambio
+            return
+
+        self._matcher = matcher
+        self._mtime = mtime
+        logger.info("FAQ loaded: %s entries from %s", len(matcher.faqs), self.path)
+
+    def answer(self, text: str) -> Optional[str]:
+        """
+        Devuelve la respuesta local si hay una FAQ que encaje con confianza, si no None.
+        """
+        self._maybe_reload()
+        self.total += 1
+
+        faq = self._matcher.match(text)
+        if faq is None:
+            return None
+
+        self.local += 1
+        self.by_intent[faq.id] = self.by_intent.get(faq.id, 0) + 1
+        return faq.answer
+
+    def stats(self) -> dict:
+        return {
+            "file": str(self.path),
+            "faqs": len(self._matcher.faqs),
+            "total": self.total,
+            "local": self.local,
+            "local_rate": round(self.local / self.total, 3) if self.total else 0.0,
+            "by_intent": dict(self.by_intent),
+        }
+
+
+intent_router = IntentRouter(FAQ_FILE, FAQ_RELOAD_INTERVAL_S)
@@ -1,22 +1,35 @@
 # bot/services/sheets_service.py
 
 import os
-from functools import lru_cache
+from functools import lru_cache, partial
 from uuid import uuid4
 from datetime import datetime, timezone
+import anyio
 import gspread
 
 from bot.schemas.lead import LeadCreate, LeadOut
 from bot.utils.phone import normalize_phone
 from bot.utils.lead_mapper import normalize_lead_record
+from bot.utils.lead_table import LeadTable
+from bot.services.admission import admission, observe_latency, single_latency_sample
 
 SHEET_NAME = os.getenv("SHEET_NAME", "KarmaBox Leads")
 SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE", "secrets/service_account.json")
+# Tiempo máximo que un handler async espera a una llamada a Sheets
+# (también es el timeout HTTP de gspread, para que las llamadas abandonadas terminen)
+SHEETS_TIMEOUT_S = float(os.getenv("SHEETS_TIMEOUT_S", "10"))
+
 
 @lru_cache
-def _get_ws():
+def _get_client():
     gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
-    sh = gc.open(SHEET_NAME)
+    gc.set_timeout(SHEETS_TIMEOUT_S)
+    return gc
+
+
+@lru_cache
+def _get_ws():
+    sh = _get_client().open(SHEET_NAME)
     return sh.sheet1
 
 
@@ -31,18 +44,56 @@ class DuplicatePhoneError(Exception):
     pass
 
 
-def list_leads() -> list[dict]:
-    records = _get_ws().get_all_records()
-    out: list[dict] = []
-    
-    for r in records:
-        nr = normalize_lead_record(r)
-        if not nr["id"]:
-            continue
-        out.append(nr)
-    return out
+class SheetsTimeoutError(Exception):
+    pass
+
+
+async def call_sheets(fn, *args, **kwargs):
+    """
+    Ejecuta una llamada bloqueante a gspread fuera del event loop (threadpool), con timeout.
+    Si vence, registra la latencia en el control de admisión y lanza SheetsTimeoutError.
+    La llamada se abandona: su hilo termina por el timeout HTTP del cliente gspread,
+    y no vuelve a registrar latencia (una sola muestra por llamada).
+    """
+    with single_latency_sample() as claim:
+        try:
+            with anyio.fail_after(SHEETS_TIMEOUT_S):
+                return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs), abandon_on_cancel=True)
+        except TimeoutError:
+            if claim.claim():
+                admission.observe("sheets", SHEETS_TIMEOUT_S * 1000)
+            raise SheetsTimeoutError(f"Google Sheets no respondió en {SHEETS_TIMEOUT_S:g}s")
+
 
+# Caché en RAM de leads normalizados + JSON por fila
+_lead_table = LeadTable()
 
+
+@observe_latency("sheets")
+def _sync_lead_table() -> LeadTable:
+    _lead_table.sync(_get_ws().get_all_values())
+    return _lead_table
+
+
+def list_leads_json() -> bytes:
+    """
+    Listado de leads ya serializado a JSON (bytes), reutilizando la caché por fila.
+    """
+    return _sync_lead_table().json_bytes()
+
+
+def has_cached_leads() -> bool:
+    return _lead_table.loaded
+
+
+def cached_leads_json() -> bytes:
+    """
+    Última copia en caché del listado, sin leer la sheet (comprobar antes has_cached_leads()).
+    """
+    return _lead_table.json_bytes()
+
+
+@observe_latency("sheets")
 def save_lead(payload: LeadCreate) -> LeadOut:
     rows = _get_ws().get_all_records()
     if any(normalize_phone(r.get("phone", "")) == payload.phone for r in rows):
@@ -63,9 +114,11 @@ def save_lead(payload: LeadCreate) -> LeadOut:
         lead.address,
         payload.source or "",
     ])
+    _lead_table.upsert(normalize_lead_record({**lead.model_dump(), "source": payload.source or ""}))
     return lead
 
 
+@observe_latency("sheets")
 def update_lead_by_id(lead_id: str, updates: dict) -> dict:
     """
     Actualiza un lead por su 'id' en Google Sheets.
@@ -121,7 +174,9 @@ def update_lead_by_id(lead_id: str, updates: dict) -> dict:
     #devolver fila actualizada como dict
     updated_row = _get_ws().row_values(target_row)
     raw = {headers[i]: (updated_row[i] if i < len(updated_row) else "") for i in range(len(headers))}
-    return normalize_lead_record(raw)
+    updated = normalize_lead_record(raw)
+    _lead_table.upsert(updated)
+    return updated
 
 
 PROCESSED_MESSAGES_TAB = os.getenv("PROCESSED_MESSAGES_TAB", "processed_messages")
@@ -131,8 +186,7 @@ PROCESSED_MESSAGES_TAB = os.getenv("PROCESSED_MESSAGES_TAB", "processed_messages
 
 @lru_cache
 def _get_spreadsheet():
-    gc = gspread.service_account(filename=SERVICE_ACCOUNT_FILE)
-    return gc.open(SHEET_NAME)
+    return _get_client().open(SHEET_NAME)
 
 
 
@@ -155,6 +209,7 @@ def _get_processed_ws():
 
 
 
+@observe_latency("sheets")
 def was_message_processed(message_id: str) -> bool:
     if not message_id:
         return False
@@ -165,6 +220,7 @@ def was_message_processed(message_id: str) -> bool:
 
 
 
+@observe_latency("sheets")
 def mark_message_processed(message_id: str) -> None:
     if not message_id:
         return
@@ -0,0 +1,115 @@
+# bot/utils/lead_table.py
+
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from bot.utils.lead_mapper import normalize_lead_record
+
+
+def _dumps(record: Dict[str, str]) -> bytes:
+    # Mismo formato que JSONResponse de FastAPI/Starlette
+    return json.dumps(record, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _row_digest(raw: tuple) -> int:
+    # Solo para detectar cambios dentro del proceso: no se guarda la fila original
+    return hash(raw)
+
+
+class LeadRow:
+    """
+    Lead normalizado en memoria (con __slots__, sin dict por instancia).
+    - json: bytes JSON de la fila, precalculados (única copia de los campos)
+    - digest: hash de la fila original de la sheet, para detectar cambios sin re-normalizar
+    """
+
+    __slots__ = ("id", "digest", "json")
+
+    def __init__(self, record: Dict[str, str], digest: Optional[int] = None):
+        self.id = record["id"]
+        self.digest = digest
+        self.json = _dumps(record)
+
+
+class LeadTable:
+    """
+    Caché de leads sincronizada con los valores de Google Sheets.
+    - sync() solo re-normaliza/re-serializa las filas que han cambiado
+    - json_bytes() devuelve el listado ya serializado (se recalcula solo si hubo cambios)
+    """
+
+    def __init__(self):
+        self._rows: List[LeadRow] = []
+        self._index: Dict[str, int] = {}  # id -> posición en _rows
+        self._json: Optional[bytes] = None
+        self._lock = threading.Lock()
+        self.loaded = False  # True tras el primer sync() (la tabla refleja la sheet)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def sync(self, values: Sequence[Sequence[Any]]) -> None:
+        """
+        values: salida de gspread get_all_values() (1ª fila = headers)
+        """
+        with self._lock:
+            if not values:
+                self.loaded = True
+                self._replace([])
+                return
+
+            headers = list(values[0])
+            id_col = headers.index("id") if "id" in headers else None
+
+            self.loaded = True
+            rows: List[LeadRow] = []
+            for values_row in values[1:]:
+                raw = tuple(values_row)
+                digest = _row_digest(raw)
+
+                if id_col is not None and id_col < len(raw):
+                    pos = self._index.get(str(raw[id_col]).strip())
+                    cached = self._rows[pos] if pos is not None else None
+                    if cached is not None and cached.digest == digest:
+                        rows.append(cached)
+                        continue
+
+                record = normalize_lead_record(dict(zip(headers, raw)))
+                if not record["id"]:
+                    continue
+                rows.append(LeadRow(record, digest))
+
+            self._replace(rows)
+
+    def upsert(self, record: Dict[str, str]) -> None:
+        """
+        Sustituye (o añade al final) un lead ya normalizado, p.ej. tras
+        save_lead/update_lead_by_id, sin esperar al siguiente sync().
+        El siguiente sync() vuelve a comprobar la fila contra la sheet.
+        """
+        if not record.get("id"):
+            return
+        row = LeadRow(record)
+        with self._lock:
+            pos = self._index.get(row.id)
+            if pos is None:
+                self._index[row.id] = len(self._rows)
+                self._rows.append(row)
+            else:
+                self._rows[pos] = row
+            self._json = None
+
+    def json_bytes(self) -> bytes:
+        with self._lock:
+            if self._json is None:
+                self._json = b"[" + b",".join(r.json for r in self._rows) + b"]"
+            return self._json
+
+    def _replace(self, rows: List[LeadRow]) -> None:
+        unchanged = len(rows) == len(self._rows) and all(a is b for a, b in zip(rows, self._rows))
+        if unchanged and self._json is not None:
+            return
+        self._rows = rows
+        self._index = {r.id: i for i, r in enumerate(rows)}
+        self._json = None
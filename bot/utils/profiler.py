@@ -0,0 +1,195 @@
+# bot/utils/profiler.py
+
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Fracción de peticiones a perfilar (0 = ninguna) y umbral "lenta" en ms (0 = desactivado).
+# Con ambos a 0 el middleware no se instala: coste cero.
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = max(1, int(os.getenv("PROFILE_KEEP", "20")))
+
+MAX_STACK_DEPTH = 64
+
+# Hilos "parados" (event loop esperando, workers del threadpool sin trabajo): no aportan
+IDLE_LEAF_FILES = ("selectors.py", "threading.py", "queue.py", "runners.py")
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_MS > 0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    parts = code.co_filename.replace("\\", "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    """
+    Muestras de pila acumuladas mientras dura una petición (formato 'folded').
+    """
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+
+
+class StackSampler:
+    """
+    Muestreador de pilas de bajo coste.
+    - Un hilo en segundo plano lee sys._current_frames() cada interval_s
+    - Solo corre mientras haya alguna petición perfilada en curso
+    - Cada muestra se suma a todas las sesiones activas (con peticiones
+      concurrentes el perfil es aproximado: incluye trabajo de las demás)
+    """
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._sessions: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> ProfileSession:
+        session = ProfileSession()
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(self.interval_s)
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+                sessions = list(self._sessions)
+
+            stacks = self._collect(own)
+            with self._lock:
+                for session in sessions:
+                    if session in self._sessions:  # no tocar sesiones ya cerradas
+                        session.stacks.update(stacks)
+
+    def _collect(self, own: int) -> List[str]:
+        out: List[str] = []
+        for tid, frame in sys._current_frames().items():
+            if tid == own:
+                continue
+            if frame.f_code.co_filename.endswith(IDLE_LEAF_FILES):
+                continue
+            labels: List[str] = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()  # raíz -> hoja
+            out.append(";".join(labels))
+        return out
+
+
+class ProfileStore:
+    """
+    Guarda los N perfiles más lentos (min-heap acotado).
+    """
+
+    def __init__(self, keep: int):
+        self.keep = max(1, keep)  # con 0 el heap vacío no tiene mínimo que comparar
+        self._heap: List[Tuple[float, int, dict]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, duration_ms: float, meta: dict, stacks: Counter) -> None:
+        with self._lock:
+            profile_id = next(self._ids)
+            entry = {
+                "id": profile_id,
+                "duration_ms": round(duration_ms, 1),
+                "samples": sum(stacks.values()),
+                **meta,
+                "stacks": stacks,
+            }
+            item = (duration_ms, profile_id, entry)
+            if len(self._heap) < self.keep:
+                heapq.heappush(self._heap, item)
+            elif duration_ms > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            entries = [e for _, _, e in sorted(self._heap, reverse=True)]
+        return [{k: v for k, v in e.items() if k != "stacks"} for e in entries]
+
+    def folded(self, profile_id: int) -> Optional[str]:
+        """
+        Perfil en formato 'folded' (flamegraph.pl, speedscope): "a;b;c 12" por línea.
+        """
+        with self._lock:
+            entry = next((e for _, _, e in self._heap if e["id"] == profile_id), None)
+        if entry is None:
+            return None
+        return "\n".join(f"{stack} {count}" for stack, count in entry["stacks"].most_common()) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+
+sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+profile_store = ProfileStore(PROFILE_KEEP)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI: perfila una muestra de peticiones (PROFILE_SAMPLE_RATE)
+    y/o las que superan PROFILE_SLOW_MS, y guarda las más lentas en profile_store.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, slow_ms: float = PROFILE_SLOW_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and self.slow_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = datetime.now(timezone.utc).isoformat()
+        session = sampler.start()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration_ms = (time.perf_counter() - t0) * 1000
+            sampler.stop(session)
+
+            slow = self.slow_ms > 0 and duration_ms >= self.slow_ms
+            if sampled or slow:
+                meta: Dict[str, str] = {
+                    "method": scope.get("method", ""),
+                    "path": scope.get("path", ""),
+                    "started_at": started_at,
+                    "reason": "slow" if slow else "sampled",
+                }
+                profile_store.add(duration_ms, meta, session.stacks)
@@ -0,0 +1,11 @@
+# bot/utils/responses.py
+
+from fastapi.responses import Response
+
+
+class RawJSONResponse(Response):
+    """
+    Respuesta JSON a partir de bytes ya serializados.
+    Evita jsonable_encoder + json.dumps en listados grandes (GET /leads).
+    """
+    media_type = "application/json"
@@ -0,0 +1,167 @@
+# bot/utils/static_assets.py
+
+import gzip
+import hashlib
+import os
+import tempfile
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se sirve gzip
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+
+HASH_LENGTH = 12
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".html", ".txt", ".map"}
+
+# (encoding, sufijo del fichero precomprimido) por orden de preferencia
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _fingerprint(path: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _write_if_changed(path: Path, content: bytes) -> None:
+    if path.exists() and path.read_bytes() == content:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Escritura atómica: nunca se sirve un asset a medio escribir (se cachea 1 año)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def build_assets(src_dir: Path, out_dir: Path) -> Dict[str, str]:
+    """
+    Genera los assets de la UI con huella de contenido.
+    - Copia cada fichero de src_dir a out_dir como nombre.<sha256>.ext
+    - Precomprime los ficheros de texto a .gz (y .br si brotli está instalado)
+    - Elimina de out_dir lo que ya no corresponde a ningún asset
+    - Devuelve el manifest {ruta_original: ruta_con_hash} (relativas, con '/')
+    """
+    manifest: Dict[str, str] = {}
+    expected: Set[Path] = set()
+
+    for src in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+        content = src.read_bytes()
+        rel = src.relative_to(src_dir)
+        hashed_rel = rel.with_name(_fingerprint(rel, content))
+        target = out_dir / hashed_rel
+
+        _write_if_changed(target, content)
+        expected.add(target)
+
+        if src.suffix in COMPRESSIBLE_SUFFIXES:
+            gz_target = target.with_name(target.name + ".gz")
+            _write_if_changed(gz_target, gzip.compress(content, compresslevel=9, mtime=0))
+            expected.add(gz_target)
+
+            if brotli is not None:
+                br_target = target.with_name(target.name + ".br")
+                _write_if_changed(br_target, brotli.compress(content, quality=11))
+                expected.add(br_target)
+
+        manifest[rel.as_posix()] = hashed_rel.as_posix()
+
+    if out_dir.exists():
+        for stale in (p for p in out_dir.rglob("*") if p.is_file()):
+            if stale in expected or stale.name.endswith(".tmp"):
+                continue  # los .tmp pueden ser de otro worker arrancando a la vez
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+
+    return manifest
+
+
+def render_index(index_path: Path, manifest: Dict[str, str], assets_prefix: str, dist_prefix: str) -> str:
+    """
+    Reescribe las referencias a assets del index.html por sus versiones con hash.
+    Ej: ./assets/css/app.css -> ./dist/css/app.<hash>.css
+    """
+    html = index_path.read_text(encoding="utf-8")
+    for original, hashed in manifest.items():
+        html = html.replace(f"{assets_prefix}{original}", f"{dist_prefix}{hashed}")
+    return html
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """
+    Parsea Accept-Encoding y devuelve las codificaciones aceptadas (q > 0).
+    """
+    out: Set[str] = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            out.add(token)
+    return out
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles para assets con hash: negocia br/gzip contra los ficheros
+    precomprimidos y marca las respuestas como immutable.
+    """
+
+    async def get_response(self, path: str, scope):
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in encodings:
+                continue
+            response = self._precompressed_response(path, suffix, encoding)
+            if response is not None:
+                return response
+
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _precompressed_response(self, path: str, suffix: str, encoding: str) -> Optional[FileResponse]:
+        full_path, stat_result = self.lookup_path(path + suffix)
+        if stat_result is None or not os.path.isfile(full_path):
+            return None
+
+        media_type = guess_type(path)[0] or "application/octet-stream"
+        return FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers={
+                "Content-Encoding": encoding,
+                "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+                "Vary": "Accept-Encoding",
+            },
+        )
@@ -0,0 +1,124 @@
+"""
+Benchmark de memoria y serialización de GET /leads (100k leads sintéticos).
+
+Compara:
+- actual: dict por lead (normalize_lead_record) + jsonable_encoder + JSONResponse
+- tabla:  LeadTable (__slots__ + JSON por fila) + RawJSONResponse
+
+Uso: python leads_bench.py [n_leads]
+"""
+
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from bot.utils.lead_mapper import normalize_lead_record
+from bot.utils.lead_table import LeadTable
+from bot.utils.responses import RawJSONResponse
+
+HEADERS = ["id", "created_at", "name", "last_name", "phone", "address", "source"]
+SOURCES = ["telegram", "whatsapp", ""]
+REPEAT = 5
+
+
+def make_values(n: int) -> list[list[str]]:
+    values = [HEADERS]
+    for i in range(n):
+        values.append([
+            str(uuid4()),
+            f"2026-01-{i % 28 + 1:02d}T10:00:00+00:00",
+            f"Nombre{i}",
+            f"Apellido{i}",
+            f"6{i:08d}",
+            f"Calle Falsa {i}, Madrid",
+            SOURCES[i % len(SOURCES)],
+        ])
+    return values
+
+
+def current_path(values: list[list[str]]) -> bytes:
+    headers = values[0]
+    out = []
+    for row in values[1:]:
+        nr = normalize_lead_record(dict(zip(headers, row)))
+        if nr["id"]:
+            out.append(nr)
+    return JSONResponse(jsonable_encoder(out)).body
+
+
+def table_path(table: LeadTable, values: list[list[str]]) -> bytes:
+    table.sync(values)
+    return RawJSONResponse(table.json_bytes()).body
+
+
+def timed(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def peak_mb(fn, *args) -> float:
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def retained_mb(build) -> float:
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current / 1024 / 1024
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    values = make_values(n)
+
+    warm = LeadTable()
+    assert current_path(values) == table_path(warm, values), "salidas distintas"
+
+    def cold_path(v):
+        return table_path(LeadTable(), v)
+
+    def report(label, fn, *args):
+        print(f"{label:<16}: {timed(fn, *args) * 1000:8.1f} ms  pico {peak_mb(fn, *args):7.1f} MB")
+
+    print(f"leads: {n}")
+    report("actual", current_path, values)
+    report("tabla (fría)", cold_path, values)
+    report("tabla (caliente)", table_path, warm, values)
+
+    # Memoria retenida por cada representación: los valores de la sheet se generan
+    # dentro de la medición y se liberan después, como en producción
+    def build_dicts():
+        fresh = make_values(n)
+        return [normalize_lead_record(dict(zip(fresh[0], row))) for row in fresh[1:]]
+
+    def build_table():
+        t = LeadTable()
+        t.sync(make_values(n))
+        return t
+
+    def build_table_joined():
+        t = build_table()
+        t.json_bytes()
+        return t
+
+    print(f"{'retenido dicts':<16}: {retained_mb(build_dicts):8.1f} MB")
+    print(f"{'retenido tabla':<16}: {retained_mb(build_table):8.1f} MB (JSON por fila)")
+    print(f"{'  + listado':<16}: {retained_mb(build_table_joined):8.1f} MB (JSON por fila + listado unido)")
+
+
+if __name__ == "__main__":
+    main()
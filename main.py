@@ -1,22 +1,56 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
 from fastapi import FastAPI
 from bot.routers.leads import router as leads_router
 from bot.routers.telegram_webhook import router as telegram_router
 from bot.routers.whatsapp_webhook import router as whatsapp_router
+from bot.routers.metrics import router as metrics_router
+from bot.routers.admin import router as admin_router
+from bot.utils.static_assets import (
+    INDEX_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    build_assets,
+    render_index,
+)
+from bot.utils.profiler import ProfilingMiddleware, profiling_enabled
 from pathlib import Path
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+
+# Respuestas (p.ej. GET /leads) por encima de este tamaño se comprimen con gzip
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
 
 app = FastAPI(title="KarmaBox Bot API", version="0.1.0")
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+# Profiler opt-in (PROFILE_SAMPLE_RATE / PROFILE_SLOW_MS); sin configurar no se instala
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
 app.include_router(leads_router)
 app.include_router(telegram_router)
 app.include_router(whatsapp_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
 
 UI_DIR = Path(__file__).resolve().parent / "bot" / "ui"
+UI_DIST_DIR = UI_DIR / "dist"
+
+# Assets con hash de contenido + precomprimidos (gzip/brotli)
+ASSET_MANIFEST = build_assets(UI_DIR / "assets", UI_DIST_DIR)
+INDEX_HTML = render_index(UI_DIR / "index.html", ASSET_MANIFEST, "./assets/", "./dist/")
+
+
+@app.get("/ui/", include_in_schema=False)
+@app.get("/ui/index.html", include_in_schema=False)
+def ui_index():
+    return HTMLResponse(INDEX_HTML, headers={"Cache-Control": INDEX_CACHE_CONTROL})
+
+
+app.mount("/ui/dist", PrecompressedStaticFiles(directory=str(UI_DIST_DIR)), name="ui-dist")
 app.mount("/ui", StaticFiles(directory=str(UI_DIR), html=True), name="ui")
 
 @app.get("/")
 def root():
-    return RedirectResponse(url="/ui/")
\ No newline at end of file
+    return RedirectResponse(url="/ui/")